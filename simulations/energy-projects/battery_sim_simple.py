@@ -2,6 +2,88 @@
 import numpy as np
 import json
 
+# action codes used by the core loop (0=idle, 1=charge, 2=discharge)
+_ACTIONS = np.array(["idle", "charge", "discharge"])
+
+# Storage facility capacity in MWh
+_CAPACITY_MWH = 100
+
+# Price floor (no ceiling)
+_P_FLOOR = -20
+
+# Synthetic day-ahead-ish price shape: baseline + evening peak. Only depends
+# on constants, so build it once at import instead of on every call
+_HOURS = np.arange(24)
+# Daily wave baseline shape
+_BASE = 45 + 10*np.sin((_HOURS - 9) * np.pi / 12)
+# Add evening peak function
+_PEAK_HEIGHT = 20
+_PEAK_CENTER = 20
+_PEAK_SIGMA = 2.5  # hours
+_EVENING_PEAK = _PEAK_HEIGHT * np.exp(
+    -((_HOURS - _PEAK_CENTER)**2) / (2 * _PEAK_SIGMA**2)
+)
+# Forecast prices (fixed shape; only the noise varies per run)
+_FORECAST_PRICES = _BASE + _EVENING_PEAK
+# Sorted copy so thresholds are a lookup instead of np.percentile every call
+_SORTED_FORECAST = np.sort(_FORECAST_PRICES)
+# float32 copy for the batch sim, halving the (S, 24) matrices' footprint
+_FORECAST_F32 = _FORECAST_PRICES.astype(np.float32)
+
+
+# percentile of the (presorted) forecast, linear interpolation like numpy's default
+def _pct(pct: float) -> float:
+    k = (pct / 100.0) * (len(_SORTED_FORECAST) - 1)
+    i = int(k)
+    j = min(i + 1, len(_SORTED_FORECAST) - 1)
+    return float(_SORTED_FORECAST[i] + (k - i) * (_SORTED_FORECAST[j] - _SORTED_FORECAST[i]))
+
+
+# realized prices for n_runs replicate days: noise + forecast + price floor,
+# all in one buffer (dtype follows the forecast array passed in)
+def _realized_prices(rng, forecast, n_runs):
+    realized = rng.standard_normal((n_runs, forecast.shape[0]), dtype=forecast.dtype)
+    realized *= 6.0
+    realized += forecast
+    np.maximum(realized, _P_FLOOR, out=realized)
+    return realized
+
+
+# core SoC loop shared by the single-run and batch entry points. Takes an
+# (S, 24) matrix of realized prices and walks the hour axis carrying per-run
+# state, so every per-hour quantity is a length-S vector; profits accumulate
+# in float64 regardless of the price dtype
+def _simulate(realized, charge_thr, discharge_thr, power_mw, rte):
+    n_runs, n_hours = realized.shape
+
+    soc = np.zeros(n_runs, dtype=realized.dtype)
+    profits = np.zeros(n_runs)
+    soc_matrix = np.empty_like(realized)
+    chg_matrix = np.zeros_like(realized)
+    dis_matrix = np.zeros_like(realized)
+    act = np.zeros((n_runs, n_hours), np.int8)
+
+    for h in range(n_hours):
+        p = realized[:, h]
+        # Charge decision: up to power limit and remaining capacity
+        can_charge = (p <= charge_thr) & (soc < _CAPACITY_MWH)
+        chg = np.where(can_charge, np.minimum(power_mw, _CAPACITY_MWH - soc), 0.0)
+        # Discharge decision: only where we didn't charge, up to SoC
+        can_discharge = ~can_charge & (p >= discharge_thr) & (soc > 0)
+        dis = np.where(can_discharge, np.minimum(power_mw, soc), 0.0)
+        soc += chg
+        soc -= dis
+        # pay price to buy, earn rte-scaled delivery on discharge
+        profits += p * (rte * dis - chg)
+        soc_matrix[:, h] = soc
+        chg_matrix[:, h] = chg
+        dis_matrix[:, h] = dis
+        act[can_charge, h] = 1
+        act[can_discharge, h] = 2
+
+    return soc_matrix, chg_matrix, dis_matrix, act, profits
+
+
 # main function, inputs from GUI, returns table
 def run_battery_sim(charge_thr_pct: float, discharge_thr_pct: float, power_mw: float, rte: float, seed: int) -> str:
     """
@@ -11,85 +93,61 @@ def run_battery_sim(charge_thr_pct: float, discharge_thr_pct: float, power_mw: f
     - enforce power limits
     - simple efficiency: when discharging, delivered energy = discharged_energy * rte
     """
-    rng = np.random.default_rng(int(seed))
-
-    # Storage facility capacity in MWh
-    capacity_mwh = 100
-
-    # Synthetic day-ahead-ish price shape: baseline + evening peak + random noise
-    hours = np.arange(24)
-    # Daily wave baseline shape
-    base = 45 + 10*np.sin((hours - 9) * np.pi / 12)
-    # Add evening peak function
-    peak_height = 20
-    peak_center = 20
-    peak_sigma = 2.5  # hours
-    evening_peak = peak_height * np.exp(
-        -((hours - peak_center)**2) / (2 * peak_sigma**2)
+    # SFC64 is a lighter bit generator than default_rng's PCG64 and this gets
+    # rebuilt on every GUI run
+    rng = np.random.Generator(np.random.SFC64(int(seed)))
+
+    # charge and discharge thresholds (lookup on the presorted forecast)
+    charge_thr = _pct(charge_thr_pct)
+    discharge_thr = _pct(discharge_thr_pct)
+
+    # One replicate day through the shared kernel (float64 so the JSON floats
+    # stay clean), then take row 0 of everything
+    realized = _realized_prices(rng, _FORECAST_PRICES, 1)
+    soc_matrix, chg_matrix, dis_matrix, act, profits = _simulate(
+        realized, charge_thr, discharge_thr, power_mw, rte
     )
-    # Add noise, maybe later add acute event impact
-    noise = rng.normal(0, 6, size=24)
-
-    # Price section and limits
-    p_floor = -20
-    p_ceiling = None
-    # Forecast prices
-    forecast_prices = base + evening_peak
-
-    # Realized prices
-    realized_prices = np.clip(forecast_prices + noise, a_min=p_floor, a_max=p_ceiling)
-
-    # charge and discharge thresholds
-    charge_thr = np.percentile(forecast_prices, charge_thr_pct)
-    discharge_thr = np.percentile(forecast_prices, discharge_thr_pct)
-
-    # init state of charge in MWh
-    soc = 0.0  # state of charge in MWh
-    profit = 0.0
-
-    # Simulation by hour
-    rows = []
-    for h, p in enumerate(realized_prices):
-        action = "idle"
-        charge_mwh = 0.0
-        discharge_mwh = 0.0
-
-        # Charge decision
-        if p <= charge_thr and soc < capacity_mwh:
-            # can charge up to power limit and remaining capacity
-            charge_mwh = min(power_mw, capacity_mwh - soc)
-            soc += charge_mwh
-            profit -= charge_mwh * p  # pay price to buy energy
-            action = "charge"
-
-        # Discharge decision
-        elif p >= discharge_thr and soc > 0:
-            discharge_mwh = min(power_mw, soc)
-            soc -= discharge_mwh
-            delivered_mwh = discharge_mwh * rte
-            profit += delivered_mwh * p
-            action = "discharge"
-
-        rows.append((h, float(p), action, soc, charge_mwh, discharge_mwh))
-
-    # Format output
+    actions = _ACTIONS[act[0]].tolist()
+
+    # Format output: columnar arrays with one .tolist() per column, instead of
+    # 24 per-hour dicts — the frontend zips columns back together as needed
     payload = {
-        "hours": hours.tolist(),
-        "forecast_prices": forecast_prices.tolist(),
-        "realized_prices": realized_prices.tolist(),
-        "charge_thr": float(charge_thr),
-        "discharge_thr": float(discharge_thr),
-        "profit": float(profit),
-        "rows": [
-            {
-                "h": int(h),
-                "price": float(p),
-                "action": str(action),
-                "soc": float(soc),
-                "chg": float(chg),
-                "dis": float(dis),
-            }
-            for (h, p, action, soc, chg, dis) in rows
-        ],
+        "hours": _HOURS.tolist(),
+        "forecast_prices": _FORECAST_PRICES.tolist(),
+        "realized_prices": realized[0].tolist(),
+        "charge_thr": charge_thr,
+        "discharge_thr": discharge_thr,
+        "profit": profits[0],
+        "actions": actions,
+        "soc": soc_matrix[0].tolist(),
+        "chg": chg_matrix[0].tolist(),
+        "dis": dis_matrix[0].tolist(),
     }
-    return json.dumps(payload)
\ No newline at end of file
+    return json.dumps(payload)
+
+
+# Monte-Carlo version: many replicate days in one call, for profit distributions
+def run_battery_sim_batch(charge_thr_pct: float, discharge_thr_pct: float, power_mw: float, rte: float, seeds):
+    """
+    Batch arbitrage sim:
+    - same strategy, limits, and price shape as run_battery_sim
+    - one (S, 24) float32 noise matrix drawn in a single call for S replicate
+      days, run through the same shared kernel as the single-day sim
+    Returns (profits, soc_matrix) as numpy arrays of shape (S,) and (S, 24).
+    The seeds seed one shared stream for the whole batch, so replicate i is
+    not bitwise-identical to run_battery_sim(..., seeds[i]).
+    """
+    seeds = [int(s) for s in np.asarray(seeds).ravel()]
+    n_runs = len(seeds)
+    rng = np.random.Generator(np.random.SFC64(seeds))
+
+    # charge and discharge thresholds (lookup on the presorted forecast)
+    charge_thr = _pct(charge_thr_pct)
+    discharge_thr = _pct(discharge_thr_pct)
+
+    realized = _realized_prices(rng, _FORECAST_F32, n_runs)
+    soc_matrix, chg_matrix, dis_matrix, act, profits = _simulate(
+        realized, charge_thr, discharge_thr, power_mw, rte
+    )
+
+    return profits, soc_matrix